@@ -17,5 +17,8 @@ setuptools.setup(
     platforms="unix",
     install_requires=[
         'webcolors==1.11.1'
-    ]
+    ],
+    extras_require={
+        'uvloop': ['uvloop']
+    }
 )
@@ -2,10 +2,13 @@ import _io
 import asyncio
 import os
 import re
+import select
 import shutil
 import signal
 import sys
 import termios
+from contextlib import contextmanager
+from operator import itemgetter
 from typing import Union, AnyStr, Optional
 
 HEIGHT = int
@@ -13,6 +16,51 @@ WIDTH = int
 ROW = int
 COLUMN = int
 
+# the terminals answer to the cursor position request "\033[6n"
+_pattern_cursor_pos = re.compile(r".*\[(?P<row>\d+);(?P<column>\d+)R")
+
+# the escape codes for the common small cursor movements, so they don't have to be formatted on every call
+_cursor_right = tuple(f"\033[{steps}C" for steps in range(64))
+_cursor_left = tuple(f"\033[{steps}D" for steps in range(64))
+_cursor_up = tuple(f"\033[{steps}A" for steps in range(64))
+_cursor_down = tuple(f"\033[{steps}B" for steps in range(64))
+
+# the event loop the SIGWINCH handler is installed in and the futures waiting for the next resize
+_resize_loop: Optional[asyncio.AbstractEventLoop] = None
+_resize_waiters: set[asyncio.Future] = set()
+
+# while True the helpers in this module leave flushing stdout to the frame() contextmanager
+_deferred_flush = False
+
+
+def _flush(flush: bool = True):
+    if flush and not _deferred_flush:
+        sys.stdout.flush()
+
+
+@contextmanager
+def frame():
+    """
+    collects everything the functions of this module write to stdout and flushes it once when the context is left,
+    instead of flushing after every single cursor movement, title change, ...
+
+    Usage
+    -----
+    >>> with frame():
+    ...     move_cursor((0, 0))
+    ...     erase_end_of_line()
+    ...     put_pixels({(0, 0): "x"})
+    """
+    global _deferred_flush
+    outer = _deferred_flush
+    _deferred_flush = True
+    try:
+        yield
+    finally:
+        _deferred_flush = outer
+        if not outer:
+            sys.stdout.flush()
+
 
 def get_size() -> tuple[WIDTH, HEIGHT]:
     """
@@ -36,7 +84,7 @@ def set_size(size: tuple[WIDTH, HEIGHT]):
     """
     width, height = size
     sys.stdout.write(f"\x1b[8;{width};{height}t")
-    sys.stdout.flush()
+    _flush()
 
 
 def set_title(title: str, flush=True):
@@ -52,7 +100,7 @@ def set_title(title: str, flush=True):
 
     """
     sys.stdout.write(f'\033]2;{title}\007')
-    sys.stdout.flush() if flush else None
+    _flush(flush)
 
 
 async def async_wait_resize() -> get_size():
@@ -64,12 +112,45 @@ async def async_wait_resize() -> get_size():
     tuple :
         the new size of the terminal
     """
-    resize_event = asyncio.Event()
-    asyncio.get_event_loop().add_signal_handler(signal.SIGWINCH, lambda: resize_event.set())
-    await resize_event.wait()
+    global _resize_loop
+    loop = asyncio.get_event_loop()
+    # the signal handler is only installed once per event loop, not for every call
+    if _resize_loop is not loop:
+        loop.add_signal_handler(signal.SIGWINCH, _notify_resize)
+        _resize_loop = loop
+    future = loop.create_future()
+    _resize_waiters.add(future)
+    try:
+        await future
+    finally:
+        # a cancelled waiter (e.g. by asyncio.wait_for) would otherwise stay until the next resize
+        _resize_waiters.discard(future)
     return get_size()
 
 
+def _notify_resize():
+    """wakes up every coroutine that is currently waiting in async_wait_resize"""
+    waiters = _resize_waiters.copy()
+    _resize_waiters.clear()
+    for future in waiters:
+        if not future.done():
+            future.set_result(None)
+
+
+def _drain(fd: int, chunk_size: int = 1024) -> bytes:
+    """
+    reads everything that is currently buffered in the fd, chunk_size bytes per read. select is used to check if
+    there is something to read, so the fd does not have to be switched to non blocking (VMIN = 0) for this
+    """
+    data = b""
+    while select.select([fd], [], [], 0)[0]:
+        _in = os.read(fd, chunk_size)
+        data += _in
+        if len(_in) < chunk_size:
+            break
+    return data
+
+
 def getch(stream: _io.TextIOWrapper = sys.stdin, blocking: bool = True, decode=True) -> Union[str, bytes]:
     """
     getch() reads a single character from the keyboard. But it does not use any buffer, so the entered character is
@@ -100,12 +181,9 @@ def getch(stream: _io.TextIOWrapper = sys.stdin, blocking: bool = True, decode=T
         else:
             new_settings[6][termios.VMIN] = 0
         termios.tcsetattr(stream, termios.TCSADRAIN, new_settings)
-        ch = os.read(stream.fileno(), 1)
-        if blocking:
-            new_settings[6][termios.VMIN] = 0
-            termios.tcsetattr(stream, termios.TCSADRAIN, new_settings)
-        while _in := os.read(stream.fileno(), 1):
-            ch += _in
+        fd = stream.fileno()
+        ch = os.read(fd, 1)
+        ch += _drain(fd)
         return ch.decode("UTF-8") if decode else ch
     finally:
         termios.tcsetattr(stream, termios.TCSADRAIN, old_settings)
@@ -140,9 +218,9 @@ async def async_getch(decode=True, stream: _io.TextIOWrapper = sys.stdin) -> Uni
         loop.add_reader(stream, future.set_result, None)
         future.add_done_callback(lambda f: loop.remove_reader(stream))
         await future
-        ch = os.read(stream.fileno(), 1)
-        while _in := os.read(stream.fileno(), 1):
-            ch += _in
+        fd = stream.fileno()
+        ch = os.read(fd, 1)
+        ch += _drain(fd)
         return ch.decode("UTF-8") if decode else ch
     finally:
         termios.tcsetattr(stream, termios.TCSADRAIN, old_settings)
@@ -163,7 +241,7 @@ def move_cursor(pos: tuple[ROW, COLUMN], flush=True):
     """
     x, y = pos
     sys.stdout.write(f"\033[{y + 1};{x + 1}H")
-    sys.stdout.flush() if flush else None
+    _flush(flush)
 
 
 def move_cursor_right(steps: int = 1, flush: bool = True):
@@ -177,8 +255,8 @@ def move_cursor_right(steps: int = 1, flush: bool = True):
     steps : int
         the number of columns to move
     """
-    sys.stdout.write(f"\033[{steps}C")
-    sys.stdout.flush() if flush else None
+    sys.stdout.write(_cursor_right[steps] if 0 <= steps < 64 else f"\033[{steps}C")
+    _flush(flush)
 
 
 def move_cursor_left(steps: int = 1, flush: bool = True):
@@ -192,8 +270,8 @@ def move_cursor_left(steps: int = 1, flush: bool = True):
     steps : int
         the number of columns to move
     """
-    sys.stdout.write(f"\033[{steps}D")
-    sys.stdout.flush() if flush else None
+    sys.stdout.write(_cursor_left[steps] if 0 <= steps < 64 else f"\033[{steps}D")
+    _flush(flush)
 
 
 def move_cursor_up(steps: int = 1, flush: bool = True):
@@ -207,8 +285,8 @@ def move_cursor_up(steps: int = 1, flush: bool = True):
         steps : int
             the number of columns to move
         """
-    sys.stdout.write(f"\033[{steps}A")
-    sys.stdout.flush() if flush else None
+    sys.stdout.write(_cursor_up[steps] if 0 <= steps < 64 else f"\033[{steps}A")
+    _flush(flush)
 
 
 def move_cursor_down(steps: int = 1, flush: bool = True):
@@ -222,8 +300,8 @@ def move_cursor_down(steps: int = 1, flush: bool = True):
         steps : int
             the number of columns to move
         """
-    sys.stdout.write(f"\033[{steps}B")
-    sys.stdout.flush() if flush else None
+    sys.stdout.write(_cursor_down[steps] if 0 <= steps < 64 else f"\033[{steps}B")
+    _flush(flush)
 
 
 def get_cursor_pos() -> tuple[ROW, COLUMN]:
@@ -242,32 +320,42 @@ def get_cursor_pos() -> tuple[ROW, COLUMN]:
     sys.stdout.flush()
     while not (_in := getch()).endswith("R"):
         pass
-    match = re.match(pattern=r".*\[(?P<row>\d+);(?P<column>\d+)R", string=_in)
+    match = _pattern_cursor_pos.match(_in)
     return ROW(int(match.group("row"))), COLUMN(int(match.group("column")))
 
 
-def save_cursor_pos():
+def save_cursor_pos(flush=True):
     """
     this save the cursor position. this position can be restored with the restore_cursor_pos function
 
+    Parameters
+    ----------
+    flush : bool
+        whether to flush stdout. the position is not saved until stdout has been flushed.
+
     See Also
     --------
     restore_cursor_pos : restores the saved position
     """
     sys.stdout.write("\033[s")
-    sys.stdout.flush()
+    _flush(flush)
 
 
-def restore_cursor_pos():
+def restore_cursor_pos(flush=True):
     """
     this functions restores the cursor pos if it was saved before with the save_cursor_pos function
 
+    Parameters
+    ----------
+    flush : bool
+        whether to flush stdout. the cursor does not move until stdout has been flushed.
+
     See Also
     --------
     save_cursor_pos : saves the position to be restored with this function
     """
     sys.stdout.write("\033[u")
-    sys.stdout.flush()
+    _flush(flush)
 
 
 def erase_end_of_line(flush=True):
@@ -280,10 +368,10 @@ def erase_end_of_line(flush=True):
         whether to flush stdout. the cursor does not move until stdout has been flushed.
     """
     sys.stdout.write(f"\033[K")
-    sys.stdout.flush() if flush else None
+    _flush(flush)
 
 
-def put_pixels(pixels: dict[tuple[int, int], AnyStr], flush=True):
+def put_pixels(pixels: dict[tuple[int, int], AnyStr], flush=True, size: Optional[tuple[WIDTH, HEIGHT]] = None):
     """
     this function allows to place characters on any position in the terminal window
 
@@ -293,13 +381,22 @@ def put_pixels(pixels: dict[tuple[int, int], AnyStr], flush=True):
         this dictionary should contain the positions as keys and the relating character as value
     flush : bool
          whether to flush stdout. the characters will not be shown until stdout has been flushed.
-    """
-    width, height = get_size()
-    for x, y in sorted(pixels.keys(), key=lambda t: t[1]):
+    size : tuple
+        the size of the terminal. if None the size is requested with get_size(), so callers that draw many times
+        (e.g. in an animation loop) can pass a known size to skip that lookup
+    """
+    width, height = size if size is not None else get_size()
+    out = []
+    cursor = None
+    for x, y in sorted(pixels, key=itemgetter(1, 0)):
         if 0 <= x < width and 0 <= y < height:
-            move_cursor((x, y), flush=False)
-            sys.stdout.write(pixels[(x, y)])
-    sys.stdout.flush() if flush else None
+            # writing a character moves the cursor one to the right, so neighbours don't need a cursor movement
+            if (x, y) != cursor:
+                out.append(f"\033[{y + 1};{x + 1}H")
+            out.append(pixels[(x, y)])
+            cursor = (x + 1, y)
+    sys.stdout.write("".join(out))
+    _flush(flush)
 
 
 def configure(
@@ -329,36 +426,40 @@ def configure(
         is written to stdin via special escape-codes.
     """
 
+    codes = []
+
     # fullscreen mode
-    (sys.stdout.write('\x1b[?1049h') if fullscreen_mode else sys.stdout.write('\x1b[?1049l')) \
-        if fullscreen_mode is not None else None
+    if fullscreen_mode is not None:
+        codes.append('\x1b[?1049h' if fullscreen_mode else '\x1b[?1049l')
 
     # console echo
-    (iflag, oflag, cflag, lflag, ispeed, ospeed, cc) \
-        = termios.tcgetattr(sys.stdin.fileno())
-    if console_echo:
-        lflag |= termios.ECHO
-    else:
-        lflag &= ~termios.ECHO
-    new_attr = [iflag, oflag, cflag, lflag, ispeed, ospeed, cc]
-    termios.tcsetattr(sys.stdin.fileno(), termios.TCSANOW, new_attr) if console_echo is not None else None
+    if console_echo is not None:
+        (iflag, oflag, cflag, lflag, ispeed, ospeed, cc) \
+            = termios.tcgetattr(sys.stdin.fileno())
+        if console_echo:
+            lflag |= termios.ECHO
+        else:
+            lflag &= ~termios.ECHO
+        new_attr = [iflag, oflag, cflag, lflag, ispeed, ospeed, cc]
+        termios.tcsetattr(sys.stdin.fileno(), termios.TCSANOW, new_attr)
 
     # show cursor
     if show_cursor is None:
         pass
     elif show_cursor:
-        sys.stdout.write("\033[?25h")
+        codes.append("\033[?25h")
     else:
-        sys.stdout.write("\033[?25l")
+        codes.append("\033[?25l")
 
     # mouse movement reporting
     if mouse_movement_reporting is None:
         pass
     elif mouse_movement_reporting:
-        sys.stdout.write("\033[?1002h\033[?1015h\033[?1006h")
-        sys.stdout.write("\033[?1003h")
+        codes.append("\033[?1002h\033[?1015h\033[?1006h")
+        codes.append("\033[?1003h")
     else:
-        sys.stdout.write("\033[?1002l")
-        sys.stdout.write("\033[?1003l")
+        codes.append("\033[?1002l")
+        codes.append("\033[?1003l")
 
-    sys.stdout.flush()
+    sys.stdout.write("".join(codes))
+    _flush()
@@ -1,9 +1,9 @@
 from __future__ import annotations
 
-import colorsys
 import re
-from dataclasses import dataclass, field
-from typing import NamedTuple, TypeVar, Union
+from dataclasses import dataclass, FrozenInstanceError
+from functools import lru_cache
+from typing import Iterable, NamedTuple, Optional, Union
 
 import webcolors
 
@@ -11,20 +11,18 @@ _regex_rgbColor = r'rgb\s?\((?P<red>\d{1,3}),\s?(?P<green>\d{1,3}),\s?(?P<blue>\
 _regex_hslColor = r'hsl\s?\((?P<hue>\d{1,3})°?,\s?(?P<saturation>\d{1,3})%?,\s?(?P<lightness>\d{1,3})%?\)'
 _regex_cmykColor = r'cmyk\s?\((?P<cyan>\d{1,3})%?,\s?(?P<magenta>\d{1,3})%?,' \
                    r'\s?(?P<yellow>\d{1,3})%?,\s?(?P<key>\d{1,3})%?\)'
-_regex_hexColor = r'(?P<hex>#[0-9a-fA-F]+)'
+_regex_hexColor = r'(?P<hex>#(?:[0-9a-fA-F]{3}){1,2})(?![0-9a-fA-F])'
+_pattern_hexColor = re.compile(_regex_hexColor, re.ASCII)
+# rgb, hsl and cmyk in one pattern, the outer group that matched (lastgroup) tells which format it was
+_pattern_functionalColor = re.compile(
+    f"(?P<rgb>{_regex_rgbColor})|(?P<hsl>{_regex_hslColor})|(?P<cmyk>{_regex_cmykColor})", re.ASCII)
 RGB = NamedTuple("RGB", [("red", int), ("green", int), ("blue", int)])
 HSL = NamedTuple("HSL", [("hue", int), ("saturation", float), ("lightness", float)])
 CMYK = NamedTuple("CMYK", [("cyan", float), ("magenta", float), ("yellow", float), ("key", float)])
 HEX = type("HEX", (str,), {"__repr__": lambda self: f'HEX={self}'})
-T = TypeVar("T")
 number = Union[int, float]
 
 
-def _clamp(x: T, minimum: T = 0, maximum: T = 1) -> T:
-    """return a value within min and max"""
-    return max(minimum, min(x, maximum))
-
-
 def _normalize(value: number, value_range: tuple[number, number]) -> float:
     """
     normalizes a value in between a scale
@@ -41,12 +39,14 @@ def _normalize(value: number, value_range: tuple[number, number]) -> float:
     number :
         a value between 0 and 1
     """
-    return _clamp((value - min(*value_range)) / (max(*value_range) - min(*value_range)))
+    low, high = value_range
+    if low > high:
+        low, high = high, low
+    x = (value - low) / (high - low)
+    return x if 0 <= x <= 1 else 1 if x > 1 else 0
 
 
-def _rgb_to_xterm_256(rgb: RGB) -> int:
-    r, g, b = rgb
-
+def _compute_xterm_256(r: number, g: number, b: number) -> int:
     if r == g == b:
         return 16 if sum([r, g, b]) < 24 else (
             231 if sum([r, g, b]) > 744 else int(round((float(r - 8) / 247) * 24) + 232))
@@ -55,6 +55,23 @@ def _rgb_to_xterm_256(rgb: RGB) -> int:
             16 + (36 * round(float(r) / 255 * 5)) + (6 * round(float(g) / 255 * 5)) + round(float(b) / 255 * 5))
 
 
+# lookup tables for _rgb_to_xterm_256, one entry per channel value (0-255)
+_XTERM_CHANNEL = bytes(round(v / 255 * 5) for v in range(256))
+_XTERM_GRAY = bytes(_compute_xterm_256(v, v, v) for v in range(256))
+
+
+def _rgb_to_xterm_256(rgb: RGB) -> int:
+    r, g, b = rgb
+
+    # the tables only cover integers from 0 to 255, negative indices would silently wrap around
+    if (isinstance(r, int) and isinstance(g, int) and isinstance(b, int)
+            and 0 <= r <= 255 and 0 <= g <= 255 and 0 <= b <= 255):
+        if r == g == b:
+            return _XTERM_GRAY[r]
+        return 16 + 36 * _XTERM_CHANNEL[r] + 6 * _XTERM_CHANNEL[g] + _XTERM_CHANNEL[b]
+    return _compute_xterm_256(r, g, b)
+
+
 def _rgb_to_cmyk(rgb: RGB) -> CMYK:
     r, g, b = rgb
 
@@ -64,44 +81,86 @@ def _rgb_to_cmyk(rgb: RGB) -> CMYK:
     m = 1 - g / 255
     y = 1 - b / 255
     min_cmy = min(c, m, y)
-    return round((c - min_cmy) / (1 - min_cmy), 2), round((m - min_cmy) / (1 - min_cmy), 2), round(
-        (y - min_cmy) / (
-                1 - min_cmy), 2), round(min_cmy, 2)
+    rest = 1 - min_cmy
+    return round((c - min_cmy) / rest, 2), round((m - min_cmy) / rest, 2), round((y - min_cmy) / rest, 2), round(
+        min_cmy, 2)
 
 
 def _cmyk_to_rgb(cmyk: CMYK) -> RGB:
     c, m, y, k = cmyk
 
-    r = 255 * (1.0 - c / 100.0) * (1.0 - k / 100.0)
-    g = 255 * (1.0 - m / 100.0) * (1.0 - k / 100.0)
-    b = 255 * (1.0 - y / 100.0) * (1.0 - k / 100.0)
+    key = 1.0 - k / 100.0
+    r = 255 * (1.0 - c / 100.0) * key
+    g = 255 * (1.0 - m / 100.0) * key
+    b = 255 * (1.0 - y / 100.0) * key
     return round(r), round(g), round(b)
 
 
 def _rgb_to_hsl(rgb: RGB) -> HSL:
-    r, g, b = rgb
+    # same math as colorsys.rgb_to_hls, inlined to save the call and the list building
+    r, g, b = rgb[0] / 255, rgb[1] / 255, rgb[2] / 255
+    max_c = max(r, g, b)
+    min_c = min(r, g, b)
+    sum_c = max_c + min_c
+    range_c = max_c - min_c
+    l = sum_c / 2.0
+
+    if min_c == max_c:
+        return 0, 0.0, round(l, 2)
+    if l <= 0.5:
+        s = range_c / sum_c
+    else:
+        s = range_c / (2.0 - max_c - min_c)
 
-    r, g, b = [x / 255 for x in [r, g, b]]
-    h, l, s = colorsys.rgb_to_hls(r, g, b)
+    if r == max_c:
+        h = ((max_c - b) / range_c) - ((max_c - g) / range_c)
+    elif g == max_c:
+        h = 2.0 + ((max_c - r) / range_c) - ((max_c - b) / range_c)
+    else:
+        h = 4.0 + ((max_c - g) / range_c) - ((max_c - r) / range_c)
+    h = (h / 6.0) % 1.0
     return round(h * 360), round(s, 2), round(l, 2)
 
 
+def _hue_to_channel(m1: float, m2: float, hue: float) -> float:
+    hue = hue % 1.0
+    if hue < 1 / 6:
+        return m1 + (m2 - m1) * hue * 6.0
+    if hue < 0.5:
+        return m2
+    if hue < 2 / 3:
+        return m1 + (m2 - m1) * (2 / 3 - hue) * 6.0
+    return m1
+
+
 def _hsl_to_rgb(hsl: HSL) -> RGB:
+    # same math as colorsys.hls_to_rgb, inlined to save the call and the list building
     h, s, l = hsl
+    h, s, l = h / 360, s / 100, l / 100
 
-    r, g, b = colorsys.hls_to_rgb(h / 360, l / 100, s / 100)
-    r, g, b = [int(x * 255) for x in [r, g, b]]
-    return r, g, b
+    if s == 0.0:
+        x = int(l * 255)
+        return x, x, x
+    if l <= 0.5:
+        m2 = l * (1.0 + s)
+    else:
+        m2 = l + s - (l * s)
+    m1 = 2.0 * l - m2
+    return (int(_hue_to_channel(m1, m2, h + 1 / 3) * 255),
+            int(_hue_to_channel(m1, m2, h) * 255),
+            int(_hue_to_channel(m1, m2, h - 1 / 3) * 255))
 
 
 def no_color() -> str:
     return str(XTerm256NoColor())
 
 
+@lru_cache(maxsize=1024)
 def color(color_value: str) -> XTerm256Color:
     """
     This function takes a string containing color information or rgb values and turns that into a xterm color.
     This color object can then be used to color the output to the terminal.
+    The results are cached, calling this function again with the same value returns the same (immutable) color object.
 
     Supported Color Formats
     -----------------------
@@ -145,22 +204,23 @@ def color(color_value: str) -> XTerm256Color:
     """
 
     color_value = color_value.strip().lower()
-    if rgb_match := re.match(_regex_rgbColor, color_value):
-        r, g, b = int(rgb_match.group("red")), \
-                  int(rgb_match.group("green")), \
-                  int(rgb_match.group("blue"))
-    elif hsl_match := re.match(_regex_hslColor, color_value):
-        r, g, b = _hsl_to_rgb((int(hsl_match.group("hue")),
-                               int(hsl_match.group("saturation")),
-                               int(hsl_match.group("lightness"))))
-    elif hex_match := re.match(_regex_hexColor, color_value):
+    # hex values are recognized by their first char, the other formats share a single regex
+    if color_value[:1] == "#" and (hex_match := _pattern_hexColor.match(color_value)):
         r, g, b = webcolors.hex_to_rgb(hex_match.group("hex"))
-    elif cmyk_match := re.match(_regex_cmykColor, color_value):
-        r, g, b = _cmyk_to_rgb((int(cmyk_match.group("cyan")),
-                                int(cmyk_match.group("magenta")),
-                                int(cmyk_match.group("yellow")),
-                                int(cmyk_match.group("key"))))
-
+    elif match := _pattern_functionalColor.match(color_value):
+        if match.lastgroup == "rgb":
+            r, g, b = int(match.group("red")), \
+                      int(match.group("green")), \
+                      int(match.group("blue"))
+        elif match.lastgroup == "hsl":
+            r, g, b = _hsl_to_rgb((int(match.group("hue")),
+                                   int(match.group("saturation")),
+                                   int(match.group("lightness"))))
+        else:
+            r, g, b = _cmyk_to_rgb((int(match.group("cyan")),
+                                    int(match.group("magenta")),
+                                    int(match.group("yellow")),
+                                    int(match.group("key"))))
     else:
         try:
             r, g, b = webcolors.name_to_rgb(color_value)
@@ -170,43 +230,49 @@ def color(color_value: str) -> XTerm256Color:
     return rgb(r, g, b)
 
 
+@lru_cache(maxsize=4096)
 def rgb(red: int, green: int, blue: int) -> XTerm256Color:
-    try:
-        name = webcolors.rgb_to_name((red, green, blue))
-    except ValueError:
-        name = "not defined"
+    if 0 <= red <= 255 and 0 <= green <= 255 and 0 <= blue <= 255:
+        hex_value = f"#{red:02x}{green:02x}{blue:02x}"
+    else:
+        # webcolors clamps the values into range
+        hex_value = webcolors.rgb_to_hex((red, green, blue))
 
+    xterm = _rgb_to_xterm_256((red, green, blue))
     return XTerm256Color(
         RGB=RGB(red, green, blue),
-        HEX=HEX(webcolors.rgb_to_hex((red, green, blue))),
-        HSL=HSL(*_rgb_to_hsl((red, green, blue))),
-        CMYK=CMYK(*_rgb_to_cmyk((red, green, blue))),
-        NAME=name,
-        X_TERM=f"\u001b[38;5;{_rgb_to_xterm_256((red, green, blue))}m",
-        X_TERM_BACKGROUND=f"\u001b[48;5;{_rgb_to_xterm_256(RGB(red, green, blue))}m"
+        HEX=HEX(hex_value),
+        HSL=None,
+        CMYK=None,
+        NAME=None,
+        X_TERM=f"\u001b[38;5;{xterm}m",
+        X_TERM_BACKGROUND=f"\u001b[48;5;{xterm}m"
     )
 
 
+@lru_cache(maxsize=1024)
 def hsl(hue: int, saturation: float, lightness: float) -> XTerm256Color:
     return rgb(*_hsl_to_rgb(HSL(hue, saturation, lightness)))
 
 
+@lru_cache(maxsize=1024)
 def cmyk(cyan: float, magenta: float, yellow: float, key: float) -> XTerm256Color:
     return rgb(*_cmyk_to_rgb(CMYK(cyan, magenta, yellow, key)))
 
 
+@lru_cache(maxsize=1024)
 def hex_(value: str) -> XTerm256Color:
     return rgb(*webcolors.hex_to_rgb(value))
 
 
 @dataclass(frozen=True)
 class XTerm256NoColor:
+    __slots__ = ()
 
     def __str__(self):
         return "\u001b[0m"
 
 
-@dataclass(frozen=True, eq=True)
 class XTerm256Color:
     """
     this object stores and converts colors. the different color formats can be accessed via the public attributes
@@ -224,13 +290,57 @@ class XTerm256Color:
     >>> print(f'{red:c}Red Text{no_color()}No Color{green:bg}{blue:c}Green Background and Blue Text{no_color()}')
     """
 
-    RGB: RGB = field(compare=True)
-    HEX: HEX = field(compare=False)
-    HSL: HSL = field(compare=False)
-    CMYK: CMYK = field(compare=False)
-    NAME: str = field(compare=False)
-    X_TERM: str = field(compare=False)
-    X_TERM_BACKGROUND: str = field(compare=False)
+    __slots__ = ("RGB", "HEX", "_hsl", "_cmyk", "_name", "X_TERM", "X_TERM_BACKGROUND")
+
+    def __init__(self, RGB: RGB, HEX: HEX, HSL: Optional[HSL], CMYK: Optional[CMYK], NAME: Optional[str], X_TERM: str,
+                 X_TERM_BACKGROUND: str):
+        # colors are shared by the caches of color() and rgb(), that's why they can't be changed after creation.
+        # HSL, CMYK and NAME may be None, they are then calculated from the rgb value when first used
+        set_ = object.__setattr__
+        set_(self, "RGB", RGB)
+        set_(self, "HEX", HEX)
+        set_(self, "_hsl", HSL)
+        set_(self, "_cmyk", CMYK)
+        set_(self, "_name", NAME)
+        set_(self, "X_TERM", X_TERM)
+        set_(self, "X_TERM_BACKGROUND", X_TERM_BACKGROUND)
+
+    @property
+    def HSL(self) -> HSL:
+        if self._hsl is None:
+            object.__setattr__(self, "_hsl", HSL(*_rgb_to_hsl(self.RGB)))
+        return self._hsl
+
+    @property
+    def CMYK(self) -> CMYK:
+        if self._cmyk is None:
+            object.__setattr__(self, "_cmyk", CMYK(*_rgb_to_cmyk(self.RGB)))
+        return self._cmyk
+
+    @property
+    def NAME(self) -> str:
+        if self._name is None:
+            object.__setattr__(self, "_name", webcolors.CSS3_HEX_TO_NAMES.get(self.HEX, "not defined"))
+        return self._name
+
+    def __setattr__(self, name, value):
+        raise FrozenInstanceError(f"cannot assign to field {name!r}")
+
+    def __delattr__(self, name):
+        raise FrozenInstanceError(f"cannot delete field {name!r}")
+
+    def __reduce__(self):
+        return self.__class__, (self.RGB, self.HEX, self._hsl, self._cmyk, self._name, self.X_TERM,
+                                self.X_TERM_BACKGROUND)
+
+    def __eq__(self, other):
+        # two colors are equal if their rgb values are
+        if other.__class__ is self.__class__:
+            return self.RGB == other.RGB
+        return NotImplemented
+
+    def __hash__(self):
+        return hash((self.RGB,))
 
     def __repr__(self):
         return f'[{self.X_TERM}#{XTerm256NoColor}{self.X_TERM_BACKGROUND}#{XTerm256NoColor}]' \
@@ -242,10 +352,13 @@ class XTerm256Color:
         Due to rounding errors, the process may not be able to be reversed identically."""
         if isinstance(other, (int, float)):
             h, s, l = self.HSL
-            return color(f'hsl({round(h)},{round(s * 100)},{round(_clamp(l + other) * 100)})')
+            l = l + other
+            return rgb(*_hsl_to_rgb((round(h), round(s * 100), round((0 if l < 0 else 1 if l > 1 else l) * 100))))
         elif isinstance(other, XTerm256Color):
-            r, g, b = [_clamp(round((x[0] + x[1]) / 2), minimum=0, maximum=255) for x in zip(self.RGB, other.RGB)]
-            return color(f'rgb({r},{g},{b})')
+            # the mean of two values between 0 and 255 can't leave that range, so no clamping is needed
+            r1, g1, b1 = self.RGB
+            r2, g2, b2 = other.RGB
+            return rgb(round((r1 + r2) / 2), round((g1 + g2) / 2), round((b1 + b2) / 2))
         else:
             raise TypeError(f'unsupported operand type(s) for +: Color and {type(other)}')
 
@@ -255,15 +368,27 @@ class XTerm256Color:
         Due to rounding errors, the process may not be able to be reversed identically."""
         if isinstance(other, (int, float)):
             h, s, l = self.HSL
-            return color(f'hsl({round(h)},{round(s * 100)}%,{round(_clamp(l - other) * 100)}%)')
+            l = l - other
+            return rgb(*_hsl_to_rgb((round(h), round(s * 100), round((0 if l < 0 else 1 if l > 1 else l) * 100))))
         elif isinstance(other, XTerm256Color):
-            r, g, b = [_clamp(round((x[0] - x[1]) / 2), minimum=0, maximum=255) for x in zip(self.RGB, other.RGB)]
-            return color(f'rgb({r},{g},{b})')
+            # half the difference of two values between 0 and 255 is at most 127, so only negatives are clamped
+            r1, g1, b1 = self.RGB
+            r2, g2, b2 = other.RGB
+            return rgb(max(0, round((r1 - r2) / 2)), max(0, round((g1 - g2) / 2)), max(0, round((b1 - b2) / 2)))
         else:
             raise TypeError(f'unsupported operand type(s) for -: Color and {type(other)}')
 
     def __format__(self, format_spec):
 
+        # a single spec is by far the most common case, it doesn't have to be split
+        spec = format_spec.lower()
+        if spec == "c" or spec == "color":
+            return self.X_TERM
+        elif spec == "bg" or spec == "background":
+            return self.X_TERM_BACKGROUND
+        elif not spec:
+            return ""
+
         result = ""
 
         for format_ in (s for s in format_spec.split("+") if s):
@@ -287,6 +412,30 @@ class XTerm256Color:
         yield from self.RGB
 
 
+def _next_shade(xterm_color: XTerm256Color, step: float, last: tuple[int, int, int]) -> XTerm256Color:
+    """
+    steps the lightness of the color until the xterm color changes or the last shade (white or black) is reached.
+    this does the same as repeating `xterm_color + step`, but only on the numbers, so only the final color object
+    is created instead of one for every step.
+    """
+    # the loop can take up to ten steps, so the globals it uses are looked up only once
+    to_rgb, to_hsl, to_xterm, round_ = _hsl_to_rgb, _rgb_to_hsl, _rgb_to_xterm_256, round
+
+    h, s, l = xterm_color.HSL
+    current = xterm_color.RGB
+    xterm = to_xterm(current)
+    moved = False
+    while current != last:
+        moved = True
+        l = l + step
+        current = to_rgb((round_(h), round_(s * 100), round_((0 if l < 0 else 1 if l > 1 else l) * 100)))
+        if to_xterm(current) != xterm:
+            break
+        h, s, l = to_hsl(current)
+    return rgb(*current) if moved else xterm_color
+
+
+@lru_cache(maxsize=1024)
 def lighten_color(xterm_color: XTerm256Color) -> XTerm256Color:
     """
     This function takes an xterm_color and returns the next brighter shade of it. The advantage of using this method
@@ -309,14 +458,10 @@ def lighten_color(xterm_color: XTerm256Color) -> XTerm256Color:
     XTerm256Color :
         the next brighter shade. if the color is already white, the color itself is returned
     """
-    temp = xterm_color
-    while temp.NAME != "white":
-        temp = temp + 0.1
-        if temp.X_TERM != xterm_color.X_TERM:
-            break
-    return temp
+    return _next_shade(xterm_color, 0.1, (255, 255, 255))
 
 
+@lru_cache(maxsize=1024)
 def darken_color(xterm_color: XTerm256Color) -> XTerm256Color:
     """
     This function takes an xterm_color and returns the next darker shade of it. The advantage of using this method
@@ -339,12 +484,7 @@ def darken_color(xterm_color: XTerm256Color) -> XTerm256Color:
     XTerm256Color :
         the next darker shade. if the color is already black, the color itself is returned
     """
-    temp = xterm_color
-    while temp.NAME != "black":
-        temp = temp - 0.1
-        if temp.X_TERM != xterm_color.X_TERM:
-            break
-    return temp
+    return _next_shade(xterm_color, -0.1, (0, 0, 0))
 
 
 def all_color_shades(xterm_color: XTerm256Color) -> list[XTerm256Color]:
@@ -366,17 +506,20 @@ def all_color_shades(xterm_color: XTerm256Color) -> list[XTerm256Color]:
     list:
         a list containing all color shades
     """
-    temp = xterm_color
     darker = []
-    while temp != temp.darken():
-        darker.insert(0, temp.lighten())
-        temp = temp.darken()
-
+    darken, add = darken_color, darker.append
     temp = xterm_color
+    while (shade := darken(temp)) != temp:
+        add(shade)
+        temp = shade
+    darker.reverse()
+
     brighter = []
-    while temp != temp.lighten():
-        brighter.append(temp.lighten())
-        temp = temp.lighten()
+    lighten, add = lighten_color, brighter.append
+    temp = xterm_color
+    while (shade := lighten(temp)) != temp:
+        add(shade)
+        temp = shade
 
     return darker + [xterm_color] + brighter
 
@@ -419,4 +562,49 @@ def color_scale(value: float, domain: tuple[float, float],
     r = (1 - v) * r1 + v * r2
     g = (1 - v) * g1 + v * g2
     b = (1 - v) * b1 + v * b2
-    return rgb(int(r), int(g), int(b))
\ No newline at end of file
+    return rgb(int(r), int(g), int(b))
+
+
+def color_scale_many(values: Iterable[float], domain: tuple[float, float],
+                     color_range: tuple[XTerm256Color, XTerm256Color]) -> list[XTerm256Color]:
+    """
+    Does the same as color_scale for every value, but the domain and the colors are only unpacked once.
+    Use this to map many values at once (e.g. a gradient or a heatmap).
+
+    Examples
+    --------
+    >>> white, black = color("white"), color("black")
+    >>>
+    >>> color_scale_many([0, .5, 1], (0, 1), (white, black))  # will return white, gray and black
+
+    Parameters
+    ----------
+    values :
+        the values translated to the corresponding color shades
+    domain :
+        the range of the values
+    color_range :
+        the two colors to be interpolated.
+
+    See Also
+    --------
+    color_scale : interpolates a single value
+
+    Returns
+    -------
+    list :
+        the interpolated colors, in the same order as the values
+    """
+
+    low, high = domain
+    if low > high:
+        low, high = high, low
+    span = high - low
+    (r1, g1, b1), (r2, g2, b2) = color_range
+    rgb_ = rgb
+    result = []
+    for value in values:
+        v = (value - low) / span
+        v = v if 0 <= v <= 1 else 1 if v > 1 else 0
+        result.append(rgb_(int((1 - v) * r1 + v * r2), int((1 - v) * g1 + v * g2), int((1 - v) * b1 + v * b2)))
+    return result
\ No newline at end of file
@@ -2,7 +2,7 @@ from abc import ABC
 from collections import namedtuple
 from dataclasses import dataclass, field
 from enum import unique, Enum
-from typing import Tuple
+from typing import Optional, Tuple
 
 from terminal import *
 
@@ -14,8 +14,16 @@ regex_mouse_dragged = r'(?P<escape_code>\x1b\[\<)(?P<mouse_dragged>32;)(?P<posit
 regex_mouse_right_dragged = r'(?P<escape_code>\x1b\[\<)(?P<mouse_right_dragged>34;)(?P<position>\d+;\d+)(?P<end>M)'
 regex_scroll_up = r'(?P<escape_code>\x1b\[\<)(?P<scroll_up>65;)(?P<position>\d+;\d+)(?P<end>M)'
 regex_scroll_down = r'(?P<escape_code>\x1b\[\<)(?P<scroll_down>64;)(?P<position>\d+;\d+)(?P<end>M)'
+_pattern_mouse_position = re.compile(regex_mouse_position)
+# matches every mouse event above at once, the code tells which one it is
+_pattern_mouse_event = re.compile(r'\x1b\[<(?P<code>\d+);(?P<x>\d+);(?P<y>\d+)(?P<end>[Mm])')
 
-_curr_mouse_pos = (0, 0)
+# updated in place by parse_event, so it doesn't need to rebind a global for every mouse event
+_curr_mouse_pos = [0, 0]
+
+# events are created for every input, slots save the __dict__ of each one. dataclass only supports slots since
+# python 3.10, on older versions the events simply keep their __dict__
+_slots = {"slots": True} if sys.version_info >= (3, 10) else {}
 
 Position = namedtuple("Position", "x y")
 
@@ -71,100 +79,163 @@ class MODIFIER_KEYS(Enum):
         return [enum.name for enum in cls]
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, **_slots)
 class Event(ABC):
     ...
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, **_slots)
 class ScreenClosed(Event):
     ...
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, **_slots)
 class Timeout(Event):
     ...
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, **_slots)
 class InputEvent(Event):
     _unparsed_data: str = field(repr=False)
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, **_slots)
 class UNKNOWN_EVENT(InputEvent):
     data: str
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, **_slots)
 class MouseEvent(InputEvent):
     x: int
     y: int
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, **_slots)
 class KeyboardEvent(InputEvent):
     key: Union[str, MODIFIER_KEYS]
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, **_slots)
 class Key(KeyboardEvent):
     ...
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, **_slots)
 class ModifierKey(KeyboardEvent):
     ...
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, **_slots)
 class Click(MouseEvent):
     ...
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, **_slots)
 class RightClick(MouseEvent):
     ...
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, **_slots)
 class MouseMove(MouseEvent):
     ...
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, **_slots)
 class MouseDrag(MouseEvent):
     from_x: int
     from_y: int
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, **_slots)
 class MouseRightDrag(MouseDrag):
     ...
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, **_slots)
 class MouseOn(MouseEvent):
     ...
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, **_slots)
 class MouseOff(MouseEvent):
     ...
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, **_slots)
 class ScrollUp(MouseEvent):
     times: int
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, **_slots)
 class ScrollDown(MouseEvent):
     times: int
 
 
+# events are immutable, so the events of every modifier key and printable ascii char are created once and shared
+_modifier_key_events = {key.value: ModifierKey(key=key, _unparsed_data=key.value) for key in MODIFIER_KEYS}
+_key_events = {chr(i): Key(key=chr(i), _unparsed_data=chr(i)) for i in range(32, 127)}
+
+
+def _mouse_handler(event: type, on_release: bool = False):
+    """
+    creates the function that turns a match of _pattern_mouse_event into the given event. what the event needs
+    (the previous position, the number of scrolls) is decided here once and not for every parsed event
+
+    Parameters
+    ----------
+    event : type
+        the mouse event class the handler creates
+    on_release: bool
+        if the event is also created when the button is released ("m" instead of "M")
+    """
+
+    def drag_handler(match, unparsed_event: str) -> Optional[MouseEvent]:
+        if not on_release and match.group("end") != "M":
+            return None
+        from_x, from_y = _curr_mouse_pos
+        # the terminal counts from 1
+        x = _curr_mouse_pos[0] = int(match.group("x")) - 1
+        y = _curr_mouse_pos[1] = int(match.group("y")) - 1
+        return event(x=x, y=y, from_x=from_x, from_y=from_y, _unparsed_data=unparsed_event)
+
+    def scroll_handler(match, unparsed_event: str) -> Optional[MouseEvent]:
+        if match.group("end") != "M":
+            return None
+        x = _curr_mouse_pos[0] = int(match.group("x")) - 1
+        y = _curr_mouse_pos[1] = int(match.group("y")) - 1
+        # batched scrolls repeat the escape code, a single one is already fully consumed by the match
+        times = 1 if match.end() == len(unparsed_event) else unparsed_event.count("\x1b")
+        return event(x=x, y=y, _unparsed_data=unparsed_event, times=times)
+
+    def position_handler(match, unparsed_event: str) -> Optional[MouseEvent]:
+        if not on_release and match.group("end") != "M":
+            return None
+        x = _curr_mouse_pos[0] = int(match.group("x")) - 1
+        y = _curr_mouse_pos[1] = int(match.group("y")) - 1
+        return event(x=x, y=y, _unparsed_data=unparsed_event)
+
+    if issubclass(event, MouseDrag):
+        return drag_handler
+    elif event is ScrollUp or event is ScrollDown:
+        return scroll_handler
+    else:
+        return position_handler
+
+
+# the button codes of the mouse events, only clicks are also reported when the button is released
+_mouse_handlers = {
+    "35": _mouse_handler(MouseMove),
+    "0": _mouse_handler(Click, on_release=True),
+    "2": _mouse_handler(RightClick),
+    "32": _mouse_handler(MouseDrag),
+    "34": _mouse_handler(MouseRightDrag),
+    "65": _mouse_handler(ScrollUp),
+    "64": _mouse_handler(ScrollDown),
+}
+
+
 def get_curr_mouse_pos() -> tuple[int, int]:
-    return _curr_mouse_pos
+    return _curr_mouse_pos[0], _curr_mouse_pos[1]
 
 
 async def async_next_event() -> Event:
@@ -180,7 +251,7 @@ def parse_mouse_pos(_in: str) -> Tuple[int, int]:
     this method return the mouse position from a key code
     """
 
-    if match := re.match(pattern=regex_mouse_position, string=_in):
+    if match := _pattern_mouse_position.match(_in):
         return int(match.group("x")) - 1, int(match.group("y")) - 1
     else:
         return -1, -1
@@ -191,40 +262,17 @@ def parse_event(unparsed_event: str) -> Event:
     this method converts a key code to an Interrupt Event
     """
 
-    global _curr_mouse_pos
-
-    if match := re.match(pattern=regex_mouse_move, string=unparsed_event):
-        x, y = _curr_mouse_pos = parse_mouse_pos(_in=match.group("position"))
-        return MouseMove(x=x, y=y, _unparsed_data=unparsed_event)
-
-    elif match := re.match(pattern=regex_mouse_clicked, string=unparsed_event):
-        x, y = _curr_mouse_pos = parse_mouse_pos(_in=match.group("position"))
-        return Click(x=x, y=y, _unparsed_data=unparsed_event)
-
-    elif match := re.match(pattern=regex_mouse_right_clicked, string=unparsed_event):
-        x, y = _curr_mouse_pos = parse_mouse_pos(_in=match.group("position"))
-        return RightClick(x=x, y=y, _unparsed_data=unparsed_event)
-
-    elif match := re.match(pattern=regex_mouse_dragged, string=unparsed_event):
-        from_x, from_y = _curr_mouse_pos
-        x, y = _curr_mouse_pos = parse_mouse_pos(_in=match.group("position"))
-        return MouseDrag(x=x, y=y, from_x=from_x, from_y=from_y, _unparsed_data=unparsed_event)
-
-    elif match := re.match(pattern=regex_mouse_right_dragged, string=unparsed_event):
-        from_x, from_y = _curr_mouse_pos
-        x, y = _curr_mouse_pos = parse_mouse_pos(_in=match.group("position"))
-        return MouseRightDrag(x=x, y=y, from_x=from_x, from_y=from_y, _unparsed_data=unparsed_event)
-
-    elif match := re.match(pattern=regex_scroll_up, string=unparsed_event):
-        x, y = _curr_mouse_pos = parse_mouse_pos(_in=match.group("position"))
-        return ScrollUp(x=x, y=y, _unparsed_data=unparsed_event, times=unparsed_event.count("\x1b"))
+    # all mouse events start with the same escape code, so for everything else the regex can be skipped
+    if unparsed_event.startswith("\x1b[<") and (match := _pattern_mouse_event.match(unparsed_event)):
+        handler = _mouse_handlers.get(match.group("code"))
+        if handler is not None and (event := handler(match, unparsed_event)) is not None:
+            return event
 
-    elif match := re.match(pattern=regex_scroll_down, string=unparsed_event):
-        x, y = _curr_mouse_pos = parse_mouse_pos(_in=match.group("position"))
-        return ScrollDown(x=x, y=y, _unparsed_data=unparsed_event, times=unparsed_event.count("\x1b"))
+    if (event := _modifier_key_events.get(unparsed_event)) is not None:
+        return event
 
-    elif unparsed_event in MODIFIER_KEYS.values():
-        return ModifierKey(key=MODIFIER_KEYS(unparsed_event), _unparsed_data=unparsed_event)
+    elif (event := _key_events.get(unparsed_event)) is not None:
+        return event
 
     elif "\x1b" not in unparsed_event and len(unparsed_event) == 1:
         return Key(key=unparsed_event, _unparsed_data=unparsed_event)
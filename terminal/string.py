@@ -4,9 +4,16 @@ import re
 from typing import Literal, Optional, Generator
 from terminal.color import no_color, XTerm256NoColor
 
-_regex_escape_code: str = r"(\x1b\[\d+(;\d+){0,2}m)*"
-_regex_escape_code_char: str = "(" + _regex_escape_code + r"(\S)" + _regex_escape_code + r")|(\s)"
-_regex_escape_code_word: str = _regex_escape_code + r"(\S+)" + _regex_escape_code
+# all groups are non capturing, only the whole match (group 0) is ever used
+_regex_escape_code: str = r"(?:\x1b\[\d+(?:;\d+){0,2}m)*"
+_regex_escape_code_char: str = "(?:" + _regex_escape_code + r"\S" + _regex_escape_code + r")|\s"
+# only matches actual escape codes, the empty matches of _regex_escape_code would be substituted for nothing
+_pattern_escape_code = re.compile(r"(?:\x1b\[\d+(?:;\d+){0,2}m)+")
+_pattern_escape_code_char = re.compile(_regex_escape_code_char)
+_pattern_color = re.compile(r"(?P<color>\x1b\[38(?:;\d+){0,2}m)")
+_pattern_bg_color = re.compile(r"(?P<bg_color>\x1b\[48(?:;\d+){0,2}m)")
+# a single escape code, the first parameter tells what the code changes
+_pattern_single_escape_code = re.compile(r"\x1b\[(?P<code>\d+)(?:;\d+){0,2}m")
 
 
 ##
@@ -15,6 +22,8 @@ _regex_escape_code_word: str = _regex_escape_code + r"(\S+)" + _regex_escape_cod
 
 
 def escaped_len(s: str):
+    if "\x1b" not in s:
+        return len(s)
     return len(without_escape_codes(s))
 
 
@@ -53,15 +62,16 @@ def just(s: str, width: int, mode: Optional[Literal["left", "right", "center"]],
     if escaped_len(fill_char) != 1:
         raise ValueError("the length of the fill_char must be 1")
 
-    width = max(escaped_len(s), width)
+    length = escaped_len(s)
+    padding = max(length, width) - length
 
     if mode == "left":
-        s = s + fill_char * (width - escaped_len(s))
+        s = s + fill_char * padding
     elif mode == "right":
-        s = fill_char * (width - escaped_len(s)) + s
+        s = fill_char * padding + s
     elif mode == "center":
-        shift = (width - escaped_len(s)) // 2
-        s = fill_char * shift + s + fill_char * (shift + (width - escaped_len(s)) % 2)
+        shift = padding // 2
+        s = fill_char * shift + s + fill_char * (shift + padding % 2)
     else:
         raise ValueError(f"invalid mode: {mode}")
 
@@ -70,15 +80,15 @@ def just(s: str, width: int, mode: Optional[Literal["left", "right", "center"]],
 
 def words(s: str) -> Generator[str, None, None]:
     """
-    splits a string into individual words. this method special escape characters aware
+    splits a string into individual words. this method special escape characters aware, the escape codes contain
+    no whitespace, so they simply stay part of the word they are attached to
 
     Returns
     -------
     Iterator:
         an Generator yielding all words
     """
-    for match in re.finditer(_regex_escape_code_word, s):
-        yield s[match.start():match.end()]
+    yield from s.split()
 
 
 def wrap(s: str, width: int) -> Generator[str, None, None]:
@@ -98,31 +108,37 @@ def wrap(s: str, width: int) -> Generator[str, None, None]:
     Iterable :
         each line is a new formatted string
     """
-    word_list = list(words(s))
     line = []
-    while word_list:
-        word = word_list.pop(0)
-        if escaped_len(" ".join(str(s) for s in [*line, word])) > width or word == "\n":
+    # the visible length of the current line, the words are joined with one space each
+    line_len = 0
+    for word in words(s):
+        word_len = escaped_len(word)
+        new_len = line_len + 1 + word_len if line else word_len
+        if new_len > width or word == "\n":
             if line:
-                yield " ".join(str(s) for s in line)
+                yield " ".join(line)
             line = [word]
+            line_len = word_len
         else:
             line.append(word)
-    yield " ".join(str(s) for s in line)
+            line_len = new_len
+    yield " ".join(line)
 
 
 def without_escape_codes(s: str) -> str:
     """
     removes all formatted codes and returns a string containing only letters, whitespace characters,
-    numbers and special characters. if the string does not contain any escape codes a new string
-    with unchanged content will be returned
+    numbers and special characters. if the string does not contain any escape codes the string itself
+    is returned without running the regex
 
     Returns
     -------
     str:
         a string without escape codes
     """
-    return re.sub(_regex_escape_code, "", s, 0)
+    if "\x1b" not in s:
+        return s
+    return _pattern_escape_code.sub("", s)
 
 
 def chars(s: str) -> Generator[str, None, None]:
@@ -134,8 +150,62 @@ def chars(s: str) -> Generator[str, None, None]:
     Iterator:
         an Generator yielding all characters
     """
-    for match in re.finditer(_regex_escape_code_char, s):
-        yield s[match.start():match.end()]
+    # without escape codes every char is matched on its own
+    if "\x1b" not in s:
+        yield from s
+        return
+    for match in _pattern_escape_code_char.finditer(s):
+        yield match.group(0)
+
+
+def styled_chars(s: str) -> Generator[str, None, None]:
+    """
+    splits a string into individual characters like chars, but every character carries all escape codes that are
+    active at its position and ends with a reset. each character can therefore be drawn on its own (e.g. only the
+    changed cells of a screen), without depending on the escape codes of the characters before it
+
+    Returns
+    -------
+    Iterator:
+        an Generator yielding all characters
+    """
+    if "\x1b" not in s:
+        yield from s
+        return
+
+    reset = no_color()
+    # the active foreground, background and all other escape codes (bold, underline, ...)
+    color, bg_color, attributes = "", "", ""
+
+    def apply(codes: str):
+        nonlocal color, bg_color, attributes
+        for m in _pattern_single_escape_code.finditer(codes):
+            code = m.group("code")
+            if code == "0":
+                color, bg_color, attributes = "", "", ""
+            elif code == "38":
+                color = m.group(0)
+            elif code == "39":
+                color = ""
+            elif code == "48":
+                bg_color = m.group(0)
+            elif code == "49":
+                bg_color = ""
+            elif m.group(0) not in attributes:
+                attributes += m.group(0)
+
+    for c in chars(s):
+        if "\x1b" in c:
+            # the codes before the visible char apply to it, the ones after it only to the following chars
+            start = leading.end() if (leading := _pattern_escape_code.match(c)) else 0
+            apply(c[:start])
+            c, trailing = c[start:start + 1], c[start + 1:]
+        else:
+            trailing = ""
+        style = attributes + color + bg_color
+        yield style + c + reset if style else c
+        if trailing:
+            apply(trailing)
 
 
 def __tokenize(s: str) -> Generator[str, None, None]:
@@ -143,33 +213,14 @@ def __tokenize(s: str) -> Generator[str, None, None]:
     In development!!! very slow at the moment
     """
 
-    pattern_color = re.compile(r"(?P<color>\x1b\[38(;\d+){0,2}m)")
-    pattern_bg_color = re.compile(r"(?P<bg_color>\x1b\[48(;\d+){0,2}m)")
-    pattern_no_color = re.compile(r"\x1b\[0m")
-
     color = ""
     bg_color = ""
+    reset = no_color()
 
     for c in chars(s):
-        if m := pattern_color.search(c):
+        if m := _pattern_color.search(c):
             color = m.group("color")
-        if m := pattern_bg_color.search(c):
+        if m := _pattern_bg_color.search(c):
             bg_color = m.group("bg_color")
 
-        yield color + bg_color + without_escape_codes(c) + no_color()
-
-    _ = """"
-    pattern = re.compile(r"(?P<color_codes>\x1b\[\d+(;\d+){0,2}m)*(?P<char>.)")
-    pattern_end = re.compile(r"(\x1b\[\d+(;\d+){0,2}m)*$")
-    s_ = pattern_end.sub("", s)
-    start_pos = 0
-    while match := pattern.search(s_, start_pos):
-        yield no_color() + s_[match.start():match.end()] + no_color()
-        if match.group("color_codes") and (m := re.match(r"\x1b\[0m", match.group("color_codes"))):
-            start_pos = match.end("char")
-        else:
-            s_ = s_[:match.start("char")] + s_[match.end("char"):]
-
-        if s_.endswith("m"):
-            s_ = pattern_end.sub("", s_)
-    """
+        yield color + bg_color + without_escape_codes(c) + reset
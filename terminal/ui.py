@@ -1,9 +1,10 @@
 import collections
-import queue
-import threading
+import selectors
+import sys
+import termios
 from statistics import mean
-from time import perf_counter
-from typing import Generator, AsyncGenerator, Literal
+from time import perf_counter_ns
+from typing import Generator, AsyncGenerator, Iterable, Literal
 
 from terminal import *
 from terminal import WIDTH, HEIGHT
@@ -31,11 +32,8 @@ def shift_pixels(pixels: dict[(X, Y), AnyStr], shift: (X, Y)) -> dict[(X, Y), An
     tuple :
         the shifted pixels
     """
-    new_pixels = {}
     shift_x, shift_y = shift
-    for x, y in pixels:
-        new_pixels[(x + shift_x, y + shift_y)] = pixels[(x, y)]
-    return new_pixels
+    return {(x + shift_x, y + shift_y): c for (x, y), c in pixels.items()}
 
 
 def Table(data: dict[str, list[str]],
@@ -54,8 +52,7 @@ def Table(data: dict[str, list[str]],
         row = vertical_sep.join(str(string.just(header, width=row_widths[i], mode="left"))
                                 for i, header in enumerate(data.keys()))
 
-        for i, c in enumerate(row):
-            pixels[(i, y)] = c
+        pixels.update(((i, y), c) for i, c in enumerate(row))
 
         y += 1
 
@@ -63,8 +60,7 @@ def Table(data: dict[str, list[str]],
                              for width in row_widths
                              )
 
-        for i, c in enumerate(str(horizontal_sep) * len(row)):
-            pixels[(i, y)] = c
+        pixels.update(((i, y), c) for i, c in enumerate(str(horizontal_sep) * len(row)))
 
         y += 1
 
@@ -72,6 +68,35 @@ def Table(data: dict[str, list[str]],
 
 
 class ProgressBar:
+    _SYMBOLS = {
+        "small": {
+            10: "▉",
+            9: "▊",
+            8: "▊",
+            7: "▋",
+            6: "▌",
+            5: "▌",
+            4: "▍",
+            3: "▎",
+            2: "▏",
+            1: "▏",
+            0: ""
+        },
+        "large": {
+            10: "▉▉",
+            9: "▉▋",
+            8: "▉▋",
+            7: "▉▍",
+            6: "▉▏",
+            5: "▉",
+            4: "▋",
+            3: "▍",
+            2: "▏",
+            1: "▏",
+            0: ""
+        }
+    }
+
     def __init__(self, size: Literal["small", "large"] = "large", show_percentage=True):
         """
 
@@ -101,52 +126,17 @@ class ProgressBar:
 
     @property
     def _symbols(self) -> dict:
-        if self.size == "small":
-            return {
-                10: "▉",
-                9: "▊",
-                8: "▊",
-                7: "▋",
-                6: "▌",
-                5: "▌",
-                4: "▍",
-                3: "▎",
-                2: "▏",
-                1: "▏",
-                0: ""
-            }
-        elif self.size == "large":
-            return {
-                10: "▉▉",
-                9: "▉▋",
-                8: "▉▋",
-                7: "▉▍",
-                6: "▉▏",
-                5: "▉",
-                4: "▋",
-                3: "▍",
-                2: "▏",
-                1: "▏",
-                0: ""
-            }
+        return self._SYMBOLS[self.size]
 
     def __str__(self):
         curr_value = int(min(100, 100 * self.value))
 
-        result = ""
-        i = 0
-        while i < curr_value:
-            inc = min(10, curr_value - i)
-            result += self._symbols[inc]
-            i += inc
-
-        width = 20 if self.size == "large" else 10
-        if self.show_percentage:
-            width += 7
+        symbols = self._symbols
+        full, rest = divmod(max(curr_value, 0), 10)
+        result = symbols[10] * full + symbols[rest]
 
         if self.show_percentage:
-            result += f' {curr_value:.1f}%'
-
+            return f'{result} {curr_value:.1f}%'
         return result
 
 
@@ -157,6 +147,26 @@ class StatusWheel:
     every time __str__ is called on this object the next symbol is returned
     """
 
+    _SYMBOLS = {
+        "large": {
+            0: "[|]",
+            1: "[/]",
+            2: "[-]",
+            3: "[\\]"
+        },
+        "small": {
+            8: "⣾",
+            7: "⣽",
+            6: "⣻",
+            5: "⢿",
+            4: "⡿",
+            3: "⣟",
+            2: "⣟",
+            1: "⣯",
+            0: "⣷"
+        }
+    }
+
     def __init__(self, size: Literal["small", "large"] = "large"):
         """
 
@@ -191,25 +201,7 @@ class StatusWheel:
 
     @property
     def _symbols(self) -> dict:
-        if self.size == "large":
-            return {
-                0: "[|]",
-                1: "[/]",
-                2: "[-]",
-                3: "[\\]"
-            }
-        elif self.size == "small":
-            return {
-                8: "⣾",
-                7: "⣽",
-                6: "⣻",
-                5: "⢿",
-                4: "⡿",
-                3: "⣟",
-                2: "⣟",
-                1: "⣯",
-                0: "⣷"
-            }
+        return self._SYMBOLS[self.size]
 
     def __str__(self) -> str:
         self.num += 1
@@ -257,10 +249,18 @@ class TerminalScreen:
         """
         self.title = title
         self.debug = debug
+        # the draw times are stored in nanoseconds
         self._draw_time = collections.deque(maxlen=50)
-        self._curr_screen_buf = {}
-        self._last_screen_buf = {}
         self._size = self.get_size()
+        width, height = self._size
+        # both screen buffers are flat lists with one entry per cell, the cell (x, y) is stored at y * width + x
+        self._curr_screen_buf = [" "] * (width * height)
+        self._last_screen_buf = [" "] * (width * height)
+        # the indices of the cells that are not blank in the current and in the last screen buffer, only these
+        # cells have to be compared when writing a frame
+        self._dirty = set()
+        self._last_dirty = set()
+        self._cursor_codes = self._make_cursor_codes(self._size)
 
     def events(self, timeout: Optional[float] = None) -> Generator[Event, None, None]:
         """
@@ -277,9 +277,8 @@ class TerminalScreen:
         Parameters
         ----------
         timeout : float
-            If the timeout value is not None, a sepperate thread will be started to listen for events.
-            The generator then only blocks for the value specified as timeout. If a timeout occurs, the "Timeout" event
-            is returned.
+            If the timeout value is not None, stdin is watched with a selector and the generator only blocks for the
+            value specified as timeout. If a timeout occurs, the "Timeout" event is returned.
 
         Yields
         -------
@@ -293,23 +292,27 @@ class TerminalScreen:
                 fullscreen_mode=None,
                 show_cursor=None
             )
+            read_event = next_event
             if timeout is None:
                 while True:
-                    yield next_event()
+                    yield read_event()
             else:
-                events = queue.Queue()
-
-                def _listen():
-                    nonlocal events
-                    while True:
-                        events.put(next_event())
-
-                threading.Thread(target=_listen, daemon=True).start()
-                while True:
-                    try:
-                        yield events.get(timeout=timeout)
-                    except queue.Empty:
-                        yield Timeout()
+                fd = sys.stdin.fileno()
+                old_settings = termios.tcgetattr(fd)
+                new_settings = termios.tcgetattr(fd)
+                # without canonical mode stdin becomes readable on every key press and not only on whole lines
+                new_settings[3] = new_settings[3] & ~(termios.ECHO | termios.ICANON)
+                termios.tcsetattr(fd, termios.TCSADRAIN, new_settings)
+                try:
+                    with selectors.DefaultSelector() as selector:
+                        selector.register(sys.stdin, selectors.EVENT_READ)
+                        while True:
+                            if selector.select(timeout):
+                                yield read_event()
+                            else:
+                                yield Timeout()
+                finally:
+                    termios.tcsetattr(fd, termios.TCSADRAIN, old_settings)
         except KeyboardInterrupt:
             yield ScreenClosed()
         finally:
@@ -344,8 +347,9 @@ class TerminalScreen:
                 fullscreen_mode=None,
                 show_cursor=None
             )
+            read_event = events.async_next_event
             while True:
-                yield await events.async_next_event()
+                yield await read_event()
         except KeyboardInterrupt:
             yield ScreenClosed()
         finally:
@@ -399,9 +403,22 @@ class TerminalScreen:
             the string
         """
         x, y = pos
-        for c in string.chars(s):
-            self._curr_screen_buf[(x, y)] = c
-            x += 1
+        # write() only draws the cells that changed, so every cell must carry its own escape codes instead of relying
+        # on the codes of the cells before it. interned cells share one object per distinct char, which also makes
+        # comparing them in write() an identity check
+        chars = [sys.intern(c) for c in string.styled_chars(s)]
+        width, height = self._size
+        if not (0 <= x and x + len(chars) <= width and 0 <= y < height):
+            # the terminal may have grown since the last frame
+            self._update_size()
+            width, height = self._size
+            if not 0 <= y < height:
+                return
+        start, end = max(x, 0), min(x + len(chars), width)
+        if start < end:
+            row = y * width
+            self._curr_screen_buf[row + start:row + end] = chars[start - x:end - x]
+            self._dirty.update(range(row + start, row + end))
 
     def put_pixels(self, pixels: dict[(X, Y), AnyStr]):
         """
@@ -413,46 +430,118 @@ class TerminalScreen:
         pixels : dict
             will be added to the current screen buffer
         """
-        self._curr_screen_buf |= pixels
+        width, height = self._size
+        if not all(0 <= x < width and 0 <= y < height for x, y in pixels):
+            # the terminal may have grown since the last frame
+            self._update_size()
+            width, height = self._size
+        buf = self._curr_screen_buf
+        dirty = self._dirty
+        for (x, y), c in pixels.items():
+            if 0 <= x < width and 0 <= y < height:
+                buf[y * width + x] = sys.intern(c)
+                dirty.add(y * width + x)
 
     def empty_screen_buffer(self):
         """
         This method clears the current screen buffer.
         This is automatically done when using the write method, which writes the buffer to the screen before clearing it.
         """
-        self._curr_screen_buf = {}
+        self._blank(self._curr_screen_buf, self._dirty)
+        self._dirty = set()
 
     def clear_screen(self):
         """
         This method removes all pixels currently displayed on the screen. This does not affect the current screen buffer.
         """
-        t1 = perf_counter()
-        put_pixels(
-            {key: " " for (key, _) in self._last_screen_buf.items()}
-        )
-        if self.debug:
-            set_title(f'{self.title} - draw-time: {mean(self._draw_time):.5f}sek')
-        self._last_screen_buf = {}
+        last = self._last_screen_buf
+        # only the cells that are not already blank have to be overwritten
+        self._draw((i, " ") for i in sorted(self._last_dirty) if last[i] != " ")
+        self._blank(last, self._last_dirty)
+        self._last_dirty = set()
 
     def write(self):
         """
         This method writes the current screen buffer to the screen. All characters currently displayed will be removed
         if they weren't added to the screen buffer again
         """
-        t1 = perf_counter()
-        if self._size != self.get_size():
-            x, y = self._size = self.get_size()
-            for i in range(x):
-                for j in range(y):
-                    self._last_screen_buf[(i, j)] = " "
-        put_pixels(
-            {key: " " for (key, _) in self._last_screen_buf.items()} | self._curr_screen_buf
-        )
-        self._draw_time.append(perf_counter() - t1)
+        t1 = perf_counter_ns()
+        self._update_size()
+        curr, last = self._curr_screen_buf, self._last_screen_buf
+        self._draw((i, curr[i]) for i in sorted(self._dirty | self._last_dirty) if curr[i] != last[i])
+        self._draw_time.append(perf_counter_ns() - t1)
         if self.debug:
-            set_title(f'{self.title} - draw-time: {mean(self._draw_time):.5f}sec')
-        self._last_screen_buf = self._curr_screen_buf
-        self._curr_screen_buf = {}
+            set_title(f'{self.title} - draw-time: {self.get_avg_write_time():.5f}sec')
+        # the current buffer becomes the last one and the old last buffer is blanked and reused as the current one
+        self._blank(last, self._last_dirty)
+        self._last_screen_buf, self._curr_screen_buf = curr, last
+        self._last_dirty, self._dirty = self._dirty, set()
+
+    def _draw(self, cells: Iterable[tuple[int, AnyStr]]):
+        """
+        This method writes the cells to the terminal. All escape codes of a frame are collected first and then written
+        to stdout at once, so that a frame only costs a single write and flush. The cursor is only moved at the start
+        of each run of adjacent cells in a row, inside a run writing a char already advances the cursor.
+
+        Parameters
+        ----------
+        cells : Iterable
+            tuples of the index of a cell in the screen buffer and the char to draw there, sorted by the index
+        """
+        width, _ = self._size
+        cursor_codes = self._cursor_codes
+        out = []
+        cursor = None
+        for i, c in cells:
+            if i != cursor or i % width == 0:
+                out.append(cursor_codes[i])
+            out.append(c)
+            cursor = i + 1
+        sys.stdout.write("".join(out))
+        sys.stdout.flush()
+
+    @staticmethod
+    def _blank(buf: list, cells: set[int]):
+        """
+        This method sets the cells of the screen buffer to blank. If every cell must be blanked (e.g. after a resize
+        or when the whole screen was drawn) the buffer is filled with a single slice assignment.
+        """
+        if len(cells) == len(buf):
+            buf[:] = [" "] * len(buf)
+        else:
+            for i in cells:
+                buf[i] = " "
+
+    def _update_size(self):
+        """
+        This method resizes the screen buffers if the size of the terminal has changed since the last call
+        """
+        size = self.get_size()
+        if self._size != size:
+            old_width, old_height = self._size
+            width, height = self._size = size
+            # move the current screen buffer to the new size, everything outside the new size is dropped
+            buf = [" "] * (width * height)
+            for y in range(min(height, old_height)):
+                line = self._curr_screen_buf[y * old_width:y * old_width + min(width, old_width)]
+                buf[y * width:y * width + len(line)] = line
+            self._curr_screen_buf = buf
+            self._dirty = {i for i, c in enumerate(buf) if c != " "}
+            # the content of a resized terminal is unknown, so every cell must be drawn again
+            self._last_screen_buf = [None] * (width * height)
+            self._last_dirty = set(range(width * height))
+            self._cursor_codes = self._make_cursor_codes(self._size)
+
+    @staticmethod
+    def _make_cursor_codes(size: tuple[WIDTH, HEIGHT]) -> list[str]:
+        """
+        Returns
+        -------
+        list :
+            the escape codes that move the cursor to each cell, stored in the same order as the screen buffers
+        """
+        width, height = size
+        return [f"\033[{y + 1};{x + 1}H" for y in range(height) for x in range(width)]
 
     def get_avg_write_time(self) -> float:
         """
@@ -463,7 +552,7 @@ class TerminalScreen:
             write method was called
 
         """
-        return mean(self._draw_time)
+        return mean(self._draw_time) / 1e9
 
     def show(self):
         """
@@ -476,6 +565,12 @@ class TerminalScreen:
         >>>         ... # main event loop
         >>> # the contextmanager calls quit on exit automatically
 
+        The screen doesn't change the asyncio event loop (policy). To use uvloop (pip install terminal[uvloop]),
+        start the event loop with it yourself:
+
+        >>> with TerminalScreen("Title") as screen:
+        >>>     uvloop.run(main(screen))  # main uses screen.async_events(), asyncio.run works the same way
+
         Warnings
         --------
         If screen.quit() is not a called before the program exists, the terminal will be unusable!